@@ -21,17 +21,27 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+import anyio.to_thread
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from routers import chat, files, health, ingest
-from services.vector_store import get_vector_store
+from services import llm, loader
+from services.vector_store import deletion_queue, flush_vector_store, get_vector_store
 from settings import settings
 
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
-app = FastAPI(title="LLM Chat with RAG vs No-RAG", version="1.0.0")
+# ORJSON encodes responses (including datetimes) in native code instead of
+# the stdlib ``json`` module.
+app = FastAPI(
+    title="LLM Chat with RAG vs No-RAG",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Teaching note: CORS is opened wide for local development convenience. In
 # production you would restrict this to trusted frontend origins.
@@ -54,15 +64,33 @@ async def startup_event() -> None:
     """Prepare resources like directories and the vector store."""
 
     logger.info("Starting LLM Chat backend")
+    # ``run_in_threadpool`` shares AnyIO's default limiter (40 threads). Size
+    # it to the machine; LLM calls are async and do not use it.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.threadpool_size
+    logger.info("Threadpool size set to {}", settings.threadpool_size)
     settings.files_dir.mkdir(parents=True, exist_ok=True)
     settings.faiss_index_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Lazy-loading strategy: we access the vector store once so it loads if
     # present, and we schedule the embedding model to load on first usage.
     get_vector_store()
+    deletion_queue.start()
+    if settings.libreoffice_daemon:
+        loader.start_office_daemon(settings.libreoffice_port)
     logger.info("Vector store ready (model loads on demand)")
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """Flush pending vector purges and release clients and processes owned by the services."""
+
+    await deletion_queue.stop()
+    await run_in_threadpool(flush_vector_store)
+    await llm.shutdown()
+    loader.stop_office_daemon()
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Simple welcome route to aid manual testing."""
@@ -74,3 +102,25 @@ app.include_router(health.router)
 app.include_router(ingest.router)
 app.include_router(files.router)
 app.include_router(chat.router)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop (libuv event loop) and httptools (C HTTP parser) ship with
+    # ``uvicorn[standard]``; uvloop is unavailable on Windows.
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        loop = "asyncio"
+    else:
+        loop = "uvloop"
+
+    uvicorn.run(
+        "app:app",
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "8000")),
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        loop=loop,
+        http="httptools",
+    )
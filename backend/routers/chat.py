@@ -5,46 +5,69 @@ retrieval-augmented answers."""
 
 from __future__ import annotations
 
-from time import perf_counter
-from typing import List
+import asyncio
+from time import perf_counter_ns
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 
+import orjson
 from fastapi import APIRouter, Depends
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
 
 from schemas.chat import ChatAnalysisResponse, ChatRequest, RetrievedContext
 from services import llm, rag_pipeline
-from services.metrics import count_tokens, summarize_metrics
+from services.metrics import count_tokens, summarize_metrics_async
 from settings import Settings, get_settings
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Response payloads are assembled from our own pipeline output, so they are
+# built with ``construct`` (no field validation) and encoded straight to
+# JSON. ``ChatRequest`` is still validated because it carries untrusted
+# client input.
+_make_retrieved = RetrievedContext.construct
+_make_analysis = ChatAnalysisResponse.construct
 
-@router.post("", response_model=ChatAnalysisResponse)
-async def chat(request: ChatRequest, settings: Settings = Depends(get_settings)) -> ChatAnalysisResponse:
+# Keep reverse proxies (nginx) and browsers from buffering the event stream,
+# otherwise tokens arrive in bursts instead of as they are generated.
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.post("", response_model=None, responses={200: {"model": ChatAnalysisResponse}})
+async def chat(request: ChatRequest, settings: Settings = Depends(get_settings)) -> ORJSONResponse:
     """Return baseline and RAG answers alongside evaluation metrics."""
 
     logger.info("Processing analytical chat request")
     top_k = request.top_k or settings.default_top_k
 
-    retrieved = await run_in_threadpool(rag_pipeline.retrieve, request.message, top_k)
-    rag_context = rag_pipeline.build_context(retrieved)
-
-    baseline_start = perf_counter()
-    baseline_message = await run_in_threadpool(llm.generate_baseline, request.message)
-    baseline_latency = perf_counter() - baseline_start
-
-    rag_start = perf_counter()
-    rag_message = await run_in_threadpool(llm.generate_with_context, request.message, rag_context)
-    rag_latency = perf_counter() - rag_start
-
-    metrics = summarize_metrics(baseline_message, rag_message)
+    # The baseline answer does not depend on retrieval, so it is generated
+    # concurrently with the retrieve + RAG generation path. Wall-clock latency
+    # becomes max(baseline, rag) instead of their sum.
+    tasks = [asyncio.create_task(_timed(llm.generate_baseline(request.message)))]
+    try:
+        retrieved = await run_in_threadpool(rag_pipeline.retrieve, request.message, top_k)
+        rag_context = rag_pipeline.build_context(retrieved)
+        tasks.append(
+            asyncio.create_task(_timed(llm.generate_with_context(request.message, rag_context)))
+        )
+        (baseline_message, baseline_latency), (rag_message, rag_latency) = await asyncio.gather(
+            *tasks
+        )
+    except BaseException:
+        # If retrieval or either answer fails (or the client disconnects),
+        # stop the other generation instead of leaving it holding an LLM slot.
+        for task in tasks:
+            task.cancel()
+        raise
+
+    metrics = await summarize_metrics_async(baseline_message, rag_message)
     avg_similarity = rag_pipeline.average_similarity(retrieved)
 
     retrieved_context = _build_retrieved_context(retrieved)
 
     logger.info(
-        "Analytical metrics computed | baseline_latency=%.3fs | rag_latency=%.3fs | cosine=%.3f | bleu=%.3f | rouge=%.3f",
+        "Analytical metrics computed | baseline_latency={:.3f}s | rag_latency={:.3f}s | cosine={:.3f} | bleu={:.3f} | rouge={:.3f}",
         baseline_latency,
         rag_latency,
         metrics["cosine_similarity"],
@@ -52,7 +75,7 @@ async def chat(request: ChatRequest, settings: Settings = Depends(get_settings))
         metrics["rouge"],
     )
 
-    return ChatAnalysisResponse(
+    response = _make_analysis(
         baseline_message=baseline_message,
         rag_message=rag_message,
         baseline_latency=baseline_latency,
@@ -65,25 +88,153 @@ async def chat(request: ChatRequest, settings: Settings = Depends(get_settings))
         avg_similarity=avg_similarity,
         retrieved_context=retrieved_context,
     )
+    # Returning the encoded response directly skips FastAPI's response_model
+    # re-validation and its ``jsonable_encoder`` walk over the nested chunks.
+    return ORJSONResponse(response.dict())
 
 
-def _build_retrieved_context(chunks: List[dict]) -> List[RetrievedContext]:
-    contexts: List[RetrievedContext] = []
-    for chunk in chunks:
-        score_value = chunk.get("score", 0.0)
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, settings: Settings = Depends(get_settings)) -> StreamingResponse:
+    """Stream baseline and RAG answers as Server-Sent Events.
+
+    Events are emitted in this order: one ``context`` event with the
+    retrieved chunks, interleaved ``token`` events tagged with their
+    ``channel`` (``baseline`` or ``rag``), and a terminal ``metrics`` event
+    computed once both answers are complete. Failures are reported as an
+    ``error`` event because the response status is already sent.
+    """
+
+    logger.info("Processing streaming chat request")
+    top_k = request.top_k or settings.default_top_k
+    return StreamingResponse(
+        _stream_events(request.message, top_k), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
+
+
+@router.post("/stream/baseline")
+async def chat_stream_baseline(request: ChatRequest) -> StreamingResponse:
+    """Stream only the baseline answer as Server-Sent Events.
+
+    Skips retrieval and metrics entirely: ``token`` events carry the answer
+    as it is generated and a final ``done`` event reports latency and token
+    count.
+    """
+
+    logger.info("Processing streaming baseline request")
+    return StreamingResponse(
+        _stream_baseline_events(request.message), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
+
+
+async def _stream_baseline_events(message: str) -> AsyncIterator[str]:
+    parts: List[str] = []
+    start = perf_counter_ns()
+    try:
+        async for token in llm.stream_baseline(message):
+            parts.append(token)
+            yield _sse("token", {"channel": "baseline", "token": token})
+    except Exception as exc:
+        logger.exception("Streaming baseline request failed")
+        yield _sse("error", {"detail": str(exc)})
+        return
+    yield _sse(
+        "done",
+        {
+            "baseline_latency": _elapsed_seconds(start),
+            "baseline_tokens": count_tokens("".join(parts)),
+        },
+    )
+
+
+async def _stream_events(message: str, top_k: int) -> AsyncIterator[str]:
+    queue: "asyncio.Queue[Tuple[str, Optional[str]]]" = asyncio.Queue()
+    parts: Dict[str, List[str]] = {"baseline": [], "rag": []}
+    latencies: Dict[str, float] = {}
+
+    async def pump(channel: str, tokens: AsyncIterator[str]) -> None:
+        start = perf_counter_ns()
         try:
-            score = float(score_value)
-        except (TypeError, ValueError):  # pragma: no cover - defensive guard
-            score = 0.0
-        contexts.append(
-            RetrievedContext(
-                file=chunk.get("meta", {}).get("file", "unknown"),
-                snippet=_safe_chunk_text(chunk),
-                score=score,
-            )
+            async for token in tokens:
+                await queue.put((channel, token))
+        finally:
+            latencies[channel] = _elapsed_seconds(start)
+            await queue.put((channel, None))
+
+    # Baseline tokens start flowing while retrieval is still running.
+    producers = [asyncio.create_task(pump("baseline", llm.stream_baseline(message)))]
+    try:
+        retrieved = await run_in_threadpool(rag_pipeline.retrieve, message, top_k)
+        rag_context = rag_pipeline.build_context(retrieved)
+        producers.append(
+            asyncio.create_task(pump("rag", llm.stream_with_context(message, rag_context)))
         )
-    return contexts
+        retrieved_context = _build_retrieved_context(retrieved)
+        yield _sse("context", {"retrieved_context": [item.dict() for item in retrieved_context]})
+
+        pending = len(producers)
+        while pending:
+            channel, token = await queue.get()
+            if token is None:
+                pending -= 1
+                continue
+            parts[channel].append(token)
+            yield _sse("token", {"channel": channel, "token": token})
+        # Re-raise any failure that ended a producer early.
+        await asyncio.gather(*producers)
+
+        baseline_message = "".join(parts["baseline"])
+        rag_message = "".join(parts["rag"])
+        metrics = await summarize_metrics_async(baseline_message, rag_message)
+    except Exception as exc:
+        logger.exception("Streaming chat request failed")
+        yield _sse("error", {"detail": str(exc)})
+        return
+    finally:
+        for task in producers:
+            task.cancel()
+
+    yield _sse(
+        "metrics",
+        {
+            "baseline_latency": latencies["baseline"],
+            "rag_latency": latencies["rag"],
+            "baseline_tokens": count_tokens(baseline_message),
+            "rag_tokens": count_tokens(rag_message),
+            "cosine_similarity": metrics["cosine_similarity"],
+            "bleu": metrics["bleu"],
+            "rouge": metrics["rouge"],
+            "avg_similarity": rag_pipeline.average_similarity(retrieved),
+        },
+    )
+
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
 
-def _safe_chunk_text(chunk: dict) -> str:
-    return (chunk.get("text") or "").strip()
+
+async def _timed(call: Awaitable[str]) -> Tuple[str, float]:
+    """Await ``call`` and return its result with the elapsed seconds."""
+
+    start = perf_counter_ns()
+    result = await call
+    return result, _elapsed_seconds(start)
+
+
+def _elapsed_seconds(start_ns: int) -> float:
+    # Integer nanosecond deltas avoid float rounding between the two reads;
+    # the API reports seconds, so convert once at the end.
+    return (perf_counter_ns() - start_ns) / 1_000_000_000
+
+
+def _build_retrieved_context(chunks: List[dict]) -> List[RetrievedContext]:
+    # Chunks come straight from ``VectorStore.search``, which already yields
+    # ``text: str``, ``score: float`` and a ``meta`` dict, so no per-item
+    # coercion is needed.
+    return [
+        _make_retrieved(
+            file=chunk["meta"].get("file", "unknown"),
+            snippet=chunk["text"].strip(),
+            score=chunk["score"],
+        )
+        for chunk in chunks
+    ]
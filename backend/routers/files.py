@@ -6,66 +6,91 @@ vector store."""
 
 from __future__ import annotations
 
+import os
+import stat
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import List
+from time import monotonic
+from typing import Dict, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse, HTMLResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response
 
 from schemas.files import FileInfo, FilePreviewResponse, FileRemovalResponse
 from services import loader
-from services.utils import safe_join
-from services.vector_store import get_vector_store
+from services.loader import PreviewError
+from services.utils import ensure_directory, safe_join
+from services.vector_store import deletion_queue
 from settings import Settings, get_settings
 
 router = APIRouter(prefix="/files", tags=["files"])
 
+_UTC = timezone.utc
 
-def _ensure_directory(settings: Settings) -> Path:
-    directory = settings.files_dir
-    directory.mkdir(parents=True, exist_ok=True)
-    return directory
+# Responses here are built from our own filesystem data. Routes declare
+# ``response_model=None`` and return encoded responses, so FastAPI neither
+# re-validates nor ``jsonable_encoder``-walks them on the way out (the schema
+# is still published through ``responses``). Models are created with
+# ``construct`` to skip field validation.
+_make_preview = FilePreviewResponse.construct
+_make_removal = FileRemovalResponse.construct
 
+# Per directory: (mtime_ns, monotonic build time, encoded JSON listing). Any
+# create, rename or unlink in the directory bumps its mtime, so an unchanged
+# mtime means the listing is still accurate. The TTL bounds staleness for
+# changes that do not touch the directory itself (e.g. in-place rewrites).
+_listing_cache: Dict[Path, Tuple[int, float, bytes]] = {}
 
-@router.get("", response_model=List[FileInfo])
-async def list_files(settings: Settings = Depends(get_settings)) -> List[FileInfo]:
-    """Return metadata for each uploaded file."""
+# Browsers may reuse a raw file for a few minutes without asking, and must
+# revalidate with ``If-None-Match`` afterwards.
+_RAW_CACHE_CONTROL = "private, max-age=300"
 
-    directory = _ensure_directory(settings)
-    files: List[FileInfo] = []
-    for path in directory.iterdir():
-        if not path.is_file():
-            continue
-        stats = path.stat()
-        uploaded_at = datetime.fromtimestamp(stats.st_mtime, tz=timezone.utc)
-        files.append(
-            FileInfo(
-                name=path.name,
-                size=stats.st_size,
-                uploaded_at=uploaded_at,
-            )
-        )
-    files.sort(key=lambda item: item.uploaded_at, reverse=True)
-    return files
 
+def invalidate_file_listing() -> None:
+    """Force the next ``GET /files`` to rescan the upload directory."""
 
-@router.get("/raw/{filename}", response_class=FileResponse)
-async def get_raw_file(filename: str, settings: Settings = Depends(get_settings)) -> FileResponse:
-    """Stream a previously uploaded file for previewing or download."""
+    _listing_cache.clear()
 
-    path = _resolve_path(filename, settings)
-    return FileResponse(path)
 
+def _ensure_directory(settings: Settings) -> Path:
+    return ensure_directory(settings.files_dir)
 
-@router.get("/{filename}", response_class=FileResponse)
-async def get_file(filename: str, settings: Settings = Depends(get_settings)) -> FileResponse:
-    """Backward-compatible raw file endpoint."""
 
-    return await get_raw_file(filename, settings)
+@router.get("", response_model=None, responses={200: {"model": List[FileInfo]}})
+async def list_files(settings: Settings = Depends(get_settings)) -> Response:
+    """Return metadata for each uploaded file."""
 
+    body = await run_in_threadpool(_list_directory, settings)
+    return Response(body, media_type="application/json")
 
-@router.get("/preview/{filename}", response_model=FilePreviewResponse)
+
+@router.get("/raw/{filename}", response_class=FileResponse)
+@router.get("/{filename}", response_class=FileResponse)
+async def get_raw_file(
+    filename: str, request: Request, settings: Settings = Depends(get_settings)
+) -> Response:
+    """Stream a previously uploaded file for previewing or download.
+
+    Also served at the backward-compatible ``/files/{filename}`` path.
+    Responses carry a strong ``ETag`` derived from the file's inode, mtime
+    and size; a matching ``If-None-Match`` is answered with ``304`` without
+    opening the file.
+    """
+
+    path, stats = await run_in_threadpool(_stat_file, filename, settings)
+    etag = f'"{stats.st_ino:x}-{stats.st_mtime_ns:x}-{stats.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": _RAW_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers, stat_result=stats)
+
+
+@router.get(
+    "/preview/{filename}", response_model=None, responses={200: {"model": FilePreviewResponse}}
+)
 async def preview_file(
     filename: str,
     as_format: str | None = Query(default=None, alias="as"),
@@ -73,47 +98,121 @@ async def preview_file(
 ):
     """Return lightweight preview data for supported file formats."""
 
-    path = _resolve_path(filename, settings)
-    try:
-        preview = loader.generate_preview(path)
-    except ValueError as exc:
-        raise HTTPException(status_code=415, detail=str(exc)) from exc
-    except RuntimeError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    path = await run_in_threadpool(_resolve_path, filename, settings)
+    preview = await run_in_threadpool(loader.generate_preview, path)
+    match preview:
+        case PreviewError(kind="unsupported", detail=detail):
+            raise HTTPException(status_code=415, detail=detail)
+        case PreviewError(detail=detail):
+            raise HTTPException(status_code=500, detail=detail)
 
     if as_format == "html" and preview.kind in {"html", "text"} and preview.html:
         return HTMLResponse(preview.html, media_type="text/html")
 
     preview_url = f"/files/raw/{filename}" if preview.kind == "pdf" else None
-    return FilePreviewResponse(
-        kind=preview.kind,
-        file_name=filename,
-        preview_url=preview_url,
-        html=preview.html,
+    return ORJSONResponse(
+        _make_preview(
+            kind=preview.kind,
+            file_name=filename,
+            preview_url=preview_url,
+            html=preview.html,
+        ).dict()
     )
 
 
-@router.delete("/{filename}", response_model=FileRemovalResponse)
-async def delete_file(filename: str, settings: Settings = Depends(get_settings)) -> FileRemovalResponse:
-    """Remove a file from disk and purge associated vectors."""
+@router.delete("/{filename}", response_model=None, responses={200: {"model": FileRemovalResponse}})
+async def delete_file(filename: str, settings: Settings = Depends(get_settings)) -> ORJSONResponse:
+    """Remove a file from disk and schedule the purge of its vectors.
+
+    Purges are batched by the vector store's deletion queue, so
+    ``vectors_removed`` is reported as ``-1`` (pending).
+    """
+
+    path = await run_in_threadpool(_resolve_path, filename, settings)
+    await run_in_threadpool(path.unlink)
+    invalidate_file_listing()
+    loader.invalidate_preview(path)
+    await deletion_queue.enqueue(filename)
 
-    path = _resolve_path(filename, settings)
-    path.unlink()
-    store = get_vector_store()
-    removed_vectors = store.remove_by_file(filename)
+    return ORJSONResponse(_make_removal(deleted=True, vectors_removed=-1).dict())
 
-    return FileRemovalResponse(deleted=True, vectors_removed=removed_vectors)
+
+def _list_directory(settings: Settings) -> bytes:
+    """Return the sorted, JSON-encoded listing, rescanning only when the directory changed.
+
+    Rows are collected as plain tuples, sorted on the integer mtime and
+    encoded by orjson in a single call; no model instance is created per
+    file, and cache hits reuse the encoded bytes as-is.
+    """
+
+    directory = _ensure_directory(settings)
+    current_mtime = os.stat(directory).st_mtime_ns
+    now = monotonic()
+    cached = _listing_cache.get(directory)
+    if (
+        cached is not None
+        and cached[0] == current_mtime
+        and now - cached[1] < settings.files_listing_ttl
+    ):
+        return cached[2]
+
+    rows: List[Tuple[int, str, int]] = []
+    # ``os.scandir`` serves the file type from the directory entry itself, so
+    # only the size/mtime lookup costs a syscall per file.
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # Uploads are always regular files; not following symlinks lets
+            # both calls answer from the cached directory-entry data.
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stats = entry.stat(follow_symlinks=False)
+            rows.append((stats.st_mtime_ns, entry.name, stats.st_size))
+    rows.sort(key=itemgetter(0), reverse=True)
+    # Field names follow ``FileInfo``; orjson serializes the datetimes.
+    body = orjson.dumps(
+        [
+            {
+                "name": name,
+                "size": size,
+                "uploaded_at": datetime.fromtimestamp(mtime_ns / 1_000_000_000, tz=_UTC),
+            }
+            for mtime_ns, name, size in rows
+        ]
+    )
+    _listing_cache[directory] = (current_mtime, now, body)
+    return body
 
 
 def _resolve_path(filename: str, settings: Settings) -> Path:
+    return _stat_file(filename, settings)[0]
+
+
+def _stat_file(filename: str, settings: Settings) -> Tuple[Path, os.stat_result]:
+    """Resolve ``filename`` inside the upload directory and stat it once."""
+
     directory = _ensure_directory(settings)
     try:
         path = safe_join(directory, filename)
     except ValueError as exc:  # pragma: no cover - defensive guard
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    if not path.exists() or not path.is_file():
+    try:
+        stats = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found") from None
+    if not stat.S_ISREG(stats.st_mode):
         raise HTTPException(status_code=404, detail="File not found")
 
-    return path
+    return path, stats
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # ``If-None-Match`` uses weak comparison, so a ``W/`` prefix is ignored.
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
 
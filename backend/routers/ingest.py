@@ -14,9 +14,10 @@ from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 
+from routers.files import invalidate_file_listing
 from schemas.ingest import FileUploadResponse, IngestRequest, IngestResponse
 from services import embeddings, loader, splitter
-from services.utils import generate_file_id, safe_join
+from services.utils import ensure_directory, generate_file_id, safe_join
 from services.vector_store import get_vector_store
 from settings import Settings, get_settings
 
@@ -24,9 +25,7 @@ router = APIRouter(tags=["ingest"])
 
 
 def _get_files_dir(settings: Settings) -> Path:
-    directory = settings.files_dir
-    directory.mkdir(parents=True, exist_ok=True)
-    return directory
+    return ensure_directory(settings.files_dir)
 
 
 @router.post("/files/upload", response_model=FileUploadResponse)
@@ -42,9 +41,10 @@ async def upload_file(
     file_id = generate_file_id(file.filename)
     destination = safe_join(files_dir, file_id)
 
-    logger.info("Saving upload %s to %s", file.filename, destination)
+    logger.info("Saving upload {} to {}", file.filename, destination)
     content = await file.read()
     destination.write_bytes(content)
+    invalidate_file_listing()
 
     return FileUploadResponse(file_id=file_id)
 
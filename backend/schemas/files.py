@@ -7,7 +7,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FileInfo(BaseModel):
@@ -18,7 +18,9 @@ class FileInfo(BaseModel):
 
 class FileRemovalResponse(BaseModel):
     deleted: bool
-    vectors_removed: int
+    vectors_removed: int = Field(
+        description="Number of vectors purged, or -1 while the purge runs in the background"
+    )
 
 
 class FilePreviewResponse(BaseModel):
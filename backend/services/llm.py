@@ -7,69 +7,141 @@ retry logic later.
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional
 
+import httpx
 from loguru import logger
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from settings import settings
 
-_client: Optional[OpenAI] = None
+_MODEL = "gpt-4o-mini"
+_BASELINE_TEMPERATURE = 0.2
+_RAG_TEMPERATURE = 0.1
 
+_client: Optional[AsyncOpenAI] = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """Return the process-wide async client, creating it on first use.
+
+    The underlying ``httpx.AsyncClient`` keeps TLS connections alive and
+    multiplexes requests over HTTP/2, so concurrent completions neither block
+    threads nor pay a new handshake each time.
+    """
 
-def _get_client() -> OpenAI:
     global _client
     if _client is None:
         if not settings.openai_api_key:
             raise RuntimeError("OPENAI_API_KEY must be set to use LLM endpoints")
-        _client = OpenAI(api_key=settings.openai_api_key)
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_concurrency,
+                max_keepalive_connections=max(1, settings.llm_concurrency // 2),
+            ),
+            http2=True,
+            timeout=60.0,
+        )
+        _client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
     return _client
 
 
-def generate_baseline(user_query: str) -> str:
+async def shutdown() -> None:
+    """Close pooled LLM connections; called on application shutdown."""
+
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _baseline_messages(user_query: str) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are a careful teaching assistant. Answer user questions "
+                "truthfully based on your general knowledge. If unsure, say so."
+            ),
+        },
+        {"role": "user", "content": user_query},
+    ]
+
+
+def _context_messages(user_query: str, context: str) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are a retrieval-augmented assistant. Use ONLY the provided "
+                "context to answer. If the context lacks the answer, state that "
+                "clearly and do not fabricate details."
+            ),
+        },
+        {
+            "role": "system",
+            "content": f"Context:\n{context}",
+        },
+        {"role": "user", "content": user_query},
+    ]
+
+
+async def generate_baseline(user_query: str) -> str:
     """Generate a response without any retrieved context."""
 
     logger.info("Generating baseline response")
     client = _get_client()
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a careful teaching assistant. Answer user questions "
-                    "truthfully based on your general knowledge. If unsure, say so."
-                ),
-            },
-            {"role": "user", "content": user_query},
-        ],
-        temperature=0.2,
+    response = await client.chat.completions.create(
+        model=_MODEL,
+        messages=_baseline_messages(user_query),
+        temperature=_BASELINE_TEMPERATURE,
     )
     return response.choices[0].message.content or ""
 
 
-def generate_with_context(user_query: str, context: str) -> str:
+async def generate_with_context(user_query: str, context: str) -> str:
     """Generate a response that must rely on supplied context snippets."""
 
-    logger.info("Generating RAG response with %d context characters", len(context))
+    logger.info("Generating RAG response with {} context characters", len(context))
     client = _get_client()
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a retrieval-augmented assistant. Use ONLY the provided "
-                    "context to answer. If the context lacks the answer, state that "
-                    "clearly and do not fabricate details."
-                ),
-            },
-            {
-                "role": "system",
-                "content": f"Context:\n{context}",
-            },
-            {"role": "user", "content": user_query},
-        ],
-        temperature=0.1,
+    response = await client.chat.completions.create(
+        model=_MODEL,
+        messages=_context_messages(user_query, context),
+        temperature=_RAG_TEMPERATURE,
     )
     return response.choices[0].message.content or ""
+
+
+async def stream_baseline(user_query: str) -> AsyncIterator[str]:
+    """Yield baseline response tokens as the model produces them."""
+
+    logger.info("Streaming baseline response")
+    async for token in _stream(_baseline_messages(user_query), _BASELINE_TEMPERATURE):
+        yield token
+
+
+async def stream_with_context(user_query: str, context: str) -> AsyncIterator[str]:
+    """Yield RAG response tokens as the model produces them."""
+
+    logger.info("Streaming RAG response with {} context characters", len(context))
+    async for token in _stream(_context_messages(user_query, context), _RAG_TEMPERATURE):
+        yield token
+
+
+async def _stream(messages: List[Dict[str, str]], temperature: float) -> AsyncIterator[str]:
+    client = _get_client()
+    stream = await client.chat.completions.create(
+        model=_MODEL,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+    )
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content
+            if token:
+                yield token
+    finally:
+        await stream.close()
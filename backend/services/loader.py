@@ -9,20 +9,53 @@ from __future__ import annotations
 from dataclasses import dataclass
 from html import escape
 from pathlib import Path
-from typing import Dict, List, Literal
+from typing import BinaryIO, Dict, List, Literal, Tuple, Union
 
+import fcntl
+import mmap
+import os
 import shutil
+import signal
+import socket
 import subprocess
 import tempfile
+import threading
+import time
+from collections import OrderedDict
 
 import docx2txt
 import mammoth
 import textract
+from filelock import FileLock
 from loguru import logger
 from pypdf import PdfReader
 
 from .utils import normalize_text
 
+# Upper bound for one LibreOffice conversion; a wedged soffice would
+# otherwise hold a worker thread forever.
+_SOFFICE_TIMEOUT_SECONDS = 120
+# How long a freshly launched unoserver gets to start listening.
+_OFFICE_STARTUP_SECONDS = 30
+
+# The preview cache is bounded by the total length of the cached HTML, not
+# by entry count: mammoth inlines images as base64, so a single preview can
+# run to tens of megabytes. Larger previews are re-rendered every time.
+_PREVIEW_CACHE_MAX_CHARS = 64 << 20
+_PREVIEW_MAX_CACHED_CHARS = 8 << 20
+# Text files from this size on are decoded from a memory map.
+_MMAP_MIN_BYTES = 1 << 20
+
+_office_daemon: subprocess.Popen[bytes] | None = None
+_office_port = 2003
+# Every worker using the daemon holds a shared lock on this file, so the one
+# that can lock it exclusively at shutdown knows it is the last.
+_office_users: BinaryIO | None = None
+
+_preview_cache: "OrderedDict[Tuple[str, int], PreviewContent]" = OrderedDict()
+_preview_cache_chars = 0
+_preview_cache_lock = threading.Lock()
+
 
 @dataclass
 class Document:
@@ -41,6 +74,23 @@ class PreviewContent:
     html: str | None = None
 
 
+@dataclass
+class PreviewError:
+    """Why a preview could not be produced.
+
+    ``unsupported`` covers file types (or ``.doc`` files without a working
+    LibreOffice) that cannot be previewed; ``failure`` is an unexpected
+    rendering error. Returned rather than raised, because probing
+    unsupported files is a routine request, not an exceptional one.
+    """
+
+    kind: Literal["unsupported", "failure"]
+    detail: str
+
+
+PreviewResult = Union[PreviewContent, PreviewError]
+
+
 def load_document(file_path: Path) -> Document:
     """Load a document and return its text content with metadata.
 
@@ -56,7 +106,7 @@ def load_document(file_path: Path) -> Document:
     """
 
     suffix = file_path.suffix.lower()
-    logger.info("Loading document from %s", file_path)
+    logger.info("Loading document from {}", file_path)
 
     if suffix == ".pdf":
         return _load_pdf(file_path)
@@ -71,11 +121,11 @@ def load_document(file_path: Path) -> Document:
 
 
 def _load_pdf(file_path: Path) -> Document:
+    # Pages are extracted serially from the one reader: a PdfReader reads
+    # through a single shared stream, so threads would interleave seeks, and
+    # pypdf holds the GIL anyway.
     reader = PdfReader(str(file_path))
-    page_texts: List[str] = []
-    for page in reader.pages:
-        extracted = page.extract_text() or ""
-        page_texts.append(normalize_text(extracted))
+    page_texts = [normalize_text(page.extract_text() or "") for page in reader.pages]
     combined = "\n".join(page_texts)
     return Document(
         text=combined,
@@ -92,13 +142,13 @@ def _load_docx(file_path: Path, original_name: str, original_type: str) -> Docum
 
 def _load_doc(file_path: Path) -> Document:
     try:
-        logger.info("Attempting textract ingestion for %s", file_path)
+        logger.info("Attempting textract ingestion for {}", file_path)
         raw_bytes = textract.process(str(file_path))
         text = raw_bytes.decode("utf-8", errors="ignore")
         normalized = normalize_text(text)
         return Document(text=normalized, metadata={"file": file_path.name, "type": "doc"})
     except Exception as exc:  # pragma: no cover - textract failure path is environment dependent
-        logger.warning("Textract failed for %s, falling back to LibreOffice conversion: %s", file_path, exc)
+        logger.warning("Textract failed for {}, falling back to LibreOffice conversion: {}", file_path, exc)
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         try:
@@ -108,8 +158,28 @@ def _load_doc(file_path: Path) -> Document:
         return _load_docx(converted, original_name=file_path.name, original_type="doc")
 
 
+def _read_text(file_path: Path) -> str:
+    """Decode a UTF-8 text file in a single C-level pass.
+
+    Large files are decoded straight from a read-only memory map, so no
+    intermediate ``bytes`` copy of the content is held alongside the string.
+    Newlines are translated like text-mode ``open`` would.
+    """
+
+    with file_path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8", "ignore")
+        else:
+            text = fh.read().decode("utf-8", "ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def _load_txt(file_path: Path) -> Document:
-    raw_text = file_path.read_text(encoding="utf-8", errors="ignore")
+    raw_text = _read_text(file_path)
     normalized = normalize_text(raw_text)
     return Document(
         text=normalized,
@@ -117,29 +187,83 @@ def _load_txt(file_path: Path) -> Document:
     )
 
 
-def generate_preview(file_path: Path) -> PreviewContent:
-    suffix = file_path.suffix.lower()
-    if suffix == ".pdf":
-        return PreviewContent(kind="pdf")
-    if suffix == ".docx":
-        html = _docx_to_html(file_path)
-        return PreviewContent(kind="html", html=html)
-    if suffix == ".doc":
-        html = _doc_to_html(file_path)
-        return PreviewContent(kind="html", html=html)
-    if suffix == ".txt":
-        html = _txt_to_html(file_path)
-        return PreviewContent(kind="text", html=html)
+def generate_preview(file_path: Path) -> PreviewResult:
+    """Return preview data, reusing the rendering for unchanged files.
+
+    Rendering Word documents (mammoth XML parsing, LibreOffice for ``.doc``)
+    dominates preview latency, and the file manager requests the same
+    previews repeatedly. Results are cached per ``(path, mtime_ns)`` so an
+    overwritten file is re-rendered. Errors are not cached.
+    """
+
+    global _preview_cache_chars
+
+    key = (str(file_path), file_path.stat().st_mtime_ns)
+    with _preview_cache_lock:
+        cached = _preview_cache.get(key)
+        if cached is not None:
+            _preview_cache.move_to_end(key)
+            return cached
+
+    preview = _render_preview(file_path)
+    if isinstance(preview, PreviewError):
+        return preview
+    size = _preview_size(preview)
+    if size > _PREVIEW_MAX_CACHED_CHARS:
+        return preview
+    with _preview_cache_lock:
+        previous = _preview_cache.pop(key, None)
+        if previous is not None:
+            _preview_cache_chars -= _preview_size(previous)
+        _preview_cache[key] = preview
+        _preview_cache_chars += size
+        while _preview_cache_chars > _PREVIEW_CACHE_MAX_CHARS:
+            _, evicted = _preview_cache.popitem(last=False)
+            _preview_cache_chars -= _preview_size(evicted)
+    return preview
 
-    raise ValueError(f"Preview not supported for file type: {suffix}")
+
+def _preview_size(preview: PreviewContent) -> int:
+    return len(preview.html) if preview.html else 0
+
+
+def invalidate_preview(file_path: Path) -> None:
+    """Drop cached previews for ``file_path`` (e.g. after deletion)."""
+
+    global _preview_cache_chars
+    path = str(file_path)
+    with _preview_cache_lock:
+        for key in [key for key in _preview_cache if key[0] == path]:
+            _preview_cache_chars -= _preview_size(_preview_cache.pop(key))
+
+
+def _render_preview(file_path: Path) -> PreviewResult:
+    suffix = file_path.suffix.lower()
+    try:
+        if suffix == ".pdf":
+            return PreviewContent(kind="pdf")
+        if suffix == ".docx":
+            html = _docx_to_html(file_path)
+            return PreviewContent(kind="html", html=html)
+        if suffix == ".doc":
+            try:
+                html = _doc_to_html(file_path)
+            except RuntimeError as exc:
+                # Without a usable LibreOffice, .doc cannot be previewed.
+                return PreviewError(kind="unsupported", detail=str(exc))
+            return PreviewContent(kind="html", html=html)
+        if suffix == ".txt":
+            html = _txt_to_html(file_path)
+            return PreviewContent(kind="text", html=html)
+    except RuntimeError as exc:
+        return PreviewError(kind="failure", detail=str(exc))
+
+    return PreviewError(kind="unsupported", detail=f"Preview not supported for file type: {suffix}")
 
 
 def _doc_to_html(file_path: Path) -> str:
     with tempfile.TemporaryDirectory() as tmp_dir:
-        try:
-            converted = _convert_doc_to_docx(file_path, Path(tmp_dir))
-        except RuntimeError as exc:
-            raise ValueError(str(exc)) from exc
+        converted = _convert_doc_to_docx(file_path, Path(tmp_dir))
         return _docx_to_html(converted)
 
 
@@ -151,7 +275,7 @@ def _docx_to_html(file_path: Path) -> str:
 
 
 def _txt_to_html(file_path: Path) -> str:
-    raw_text = file_path.read_text(encoding="utf-8", errors="ignore")
+    raw_text = _read_text(file_path)
     return _wrap_html(f"<pre>{escape(raw_text)}</pre>")
 
 
@@ -159,14 +283,144 @@ def _wrap_html(body: str) -> str:
     return "<!doctype html><html><head><meta charset=\"utf-8\"></head><body>" + body + "</body></html>"
 
 
+def start_office_daemon(port: int) -> None:
+    """Make sure a long-lived headless LibreOffice runs via ``unoserver``.
+
+    Cold-starting ``soffice`` costs seconds per ``.doc`` file, mostly UNO
+    initialisation. With the daemon running, conversions go through the
+    lightweight ``unoconvert`` client instead. Without ``unoserver``
+    installed this is a no-op and the per-file path is used.
+
+    Every worker process calls this, but only one daemon can listen on
+    ``port``: the first worker to find nothing there launches it, in its own
+    session so it outlives that worker, and the others just use it.
+    """
+
+    global _office_daemon, _office_port, _office_users
+    _office_port = port
+    unoserver_path = shutil.which("unoserver")
+    if not unoserver_path or not shutil.which("unoconvert"):
+        logger.warning("unoserver/unoconvert not found; .doc files use per-file LibreOffice")
+        return
+    if _office_users is None:
+        _office_users = _office_runtime_path("users").open("ab")
+        fcntl.flock(_office_users, fcntl.LOCK_SH)
+    with FileLock(str(_office_runtime_path("lock"))):
+        if _office_daemon_reachable():
+            return
+        logger.info("Starting LibreOffice daemon on port {}", port)
+        _office_daemon = subprocess.Popen(
+            [unoserver_path, "--interface", "127.0.0.1", "--port", str(port)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        _office_runtime_path("pid").write_text(str(_office_daemon.pid))
+        # Wait while holding the lock, so workers starting meanwhile do not
+        # launch a second daemon before this one listens.
+        deadline = time.monotonic() + _OFFICE_STARTUP_SECONDS
+        while not _office_daemon_reachable():
+            if _office_daemon.poll() is not None or time.monotonic() > deadline:
+                logger.warning("LibreOffice daemon did not start listening on port {}", port)
+                return
+            time.sleep(0.2)
+
+
+def stop_office_daemon() -> None:
+    """Stop the LibreOffice daemon if this is the last worker using it."""
+
+    global _office_daemon, _office_users
+    if _office_users is None:
+        return
+    users, _office_users = _office_users, None
+    fcntl.flock(users, fcntl.LOCK_UN)
+    try:
+        fcntl.flock(users, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        # Other workers still convert through it.
+        users.close()
+        return
+    try:
+        pid_path = _office_runtime_path("pid")
+        try:
+            pid = int(pid_path.read_text())
+        except (OSError, ValueError):
+            return
+        pid_path.unlink(missing_ok=True)
+        if _office_daemon is not None and _office_daemon.pid == pid:
+            _office_daemon.terminate()
+            try:
+                _office_daemon.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                _office_daemon.kill()
+        elif _office_daemon_reachable():
+            # Launched by a worker that has already exited.
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    finally:
+        _office_daemon = None
+        users.close()
+
+
+def _office_runtime_path(suffix: str) -> Path:
+    return Path(tempfile.gettempdir()) / f"chat-rag-unoserver-{_office_port}.{suffix}"
+
+
+def _office_daemon_reachable() -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", _office_port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def _convert_via_daemon(file_path: Path, output_dir: Path) -> Path | None:
+    """Convert through the running daemon; ``None`` means use the fallback."""
+
+    unoconvert_path = shutil.which("unoconvert")
+    if _office_users is None or not unoconvert_path or not _office_daemon_reachable():
+        return None
+
+    converted_path = output_dir / f"{file_path.stem}.docx"
+    command = [
+        unoconvert_path,
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(_office_port),
+        "--convert-to",
+        "docx",
+        str(file_path),
+        str(converted_path),
+    ]
+    try:
+        result = subprocess.run(
+            command, capture_output=True, check=False, timeout=_SOFFICE_TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("LibreOffice daemon timed out converting {}", file_path)
+        return None
+    if result.returncode != 0 or not converted_path.exists():
+        stderr = result.stderr.decode("utf-8", errors="ignore").strip()
+        logger.warning("LibreOffice daemon conversion failed for {}: {}", file_path, stderr)
+        return None
+    return converted_path
+
+
 def _convert_doc_to_docx(file_path: Path, output_dir: Path) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    converted = _convert_via_daemon(file_path, output_dir)
+    if converted is not None:
+        return converted
+
     soffice_path = shutil.which("soffice")
     if not soffice_path:
         raise RuntimeError(
             "LibreOffice (soffice) is required to process .doc files. Install it or ensure it's on PATH."
         )
 
-    output_dir.mkdir(parents=True, exist_ok=True)
     command = [
         soffice_path,
         "--headless",
@@ -176,8 +430,15 @@ def _convert_doc_to_docx(file_path: Path, output_dir: Path) -> Path:
         str(output_dir),
         str(file_path),
     ]
-    logger.info("Converting .doc to .docx via LibreOffice: %s", " ".join(command))
-    result = subprocess.run(command, capture_output=True, check=False)
+    logger.info("Converting .doc to .docx via LibreOffice: {}", " ".join(command))
+    try:
+        result = subprocess.run(
+            command, capture_output=True, check=False, timeout=_SOFFICE_TIMEOUT_SECONDS
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise RuntimeError(
+            f"LibreOffice conversion timed out after {_SOFFICE_TIMEOUT_SECONDS} seconds"
+        ) from exc
     if result.returncode != 0:
         stderr = result.stderr.decode("utf-8", errors="ignore")
         raise RuntimeError(f"LibreOffice conversion failed: {stderr.strip()}")
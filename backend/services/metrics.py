@@ -9,34 +9,57 @@ without duplicating boilerplate in the routers.
 
 from __future__ import annotations
 
+import asyncio
+import math
+import re
+from collections import Counter
 from functools import lru_cache
-from typing import Dict
+from typing import Dict, List, Sequence
 
 import numpy as np
-from nltk.translate.bleu_score import SmoothingFunction, sentence_bleu
-from rouge_score import rouge_scorer
+from fastapi.concurrency import run_in_threadpool
+from nltk.stem import porter
+from rouge_score import rouge_scorer, tokenizers
 
-from services.embeddings import embed_texts
+from services.embeddings import embed_texts_cached
 
+try:  # Optional SIMD kernels; NumPy is used when the package is missing.
+    import simsimd
+except ImportError:
+    simsimd = None
 
-def _normalize_vector(vector: np.ndarray) -> np.ndarray:
-    norm = float(np.linalg.norm(vector))
-    if norm == 0:
-        return vector
-    return vector / norm
+_BLEU_MAX_ORDER = 4
+# Matches NLTK's ``SmoothingFunction().method1`` default epsilon.
+_BLEU_EPSILON = 0.1
+_NON_ALPHANUMERIC_RE = re.compile(r"[^a-z0-9]+")
 
 
 def cosine_similarity(baseline: str, rag: str) -> float:
     """Return cosine similarity between two generated answers."""
 
-    if not baseline or not rag:
+    # Trivial cases are decided without touching the embedding model.
+    baseline_stripped = baseline.strip()
+    rag_stripped = rag.strip()
+    if not baseline_stripped or not rag_stripped:
         return 0.0
+    if baseline_stripped == rag_stripped:
+        return 1.0
 
-    vectors = embed_texts([baseline, rag])
+    vectors = embed_texts_cached([baseline, rag])
     if vectors.size == 0:
         return 0.0
 
-    baseline_vec, rag_vec = (_normalize_vector(vec) for vec in vectors)
+    matrix = vectors.astype(np.float32, copy=False)
+    if simsimd is not None:
+        # Dot product and both norms in one fused SIMD pass, no temporaries.
+        similarity = 1.0 - float(simsimd.cosine(matrix[0], matrix[1]))
+        return float(max(min(similarity, 1.0), -1.0))
+
+    # Embeddings are L2-normalized at encode time, so the dot product is the
+    # cosine. All-zero rows have no direction and score 0.
+    baseline_vec, rag_vec = matrix
+    if not baseline_vec.any() or not rag_vec.any():
+        return 0.0
     similarity = float(np.dot(baseline_vec, rag_vec))
     return float(max(min(similarity, 1.0), -1.0))
 
@@ -44,19 +67,85 @@ def cosine_similarity(baseline: str, rag: str) -> float:
 def bleu_score(reference: str, candidate: str) -> float:
     """Compute a smoothed BLEU score treating ``reference`` as ground truth."""
 
+    return bleu_scores(reference, [candidate])[0]
+
+
+def bleu_scores(reference: str, candidates: Sequence[str]) -> List[float]:
+    """Score several candidates against one reference.
+
+    Produces the same values as NLTK's ``sentence_bleu`` with uniform 4-gram
+    weights and ``method1`` smoothing, but the reference n-gram counts are
+    built once and shared by every candidate.
+    """
+
     reference_tokens = reference.split()
-    candidate_tokens = candidate.split()
-    if not reference_tokens or not candidate_tokens:
+    if not reference_tokens:
+        return [0.0] * len(candidates)
+    reference_counts = _ngram_counts(reference_tokens)
+    return [
+        _bleu(reference_counts, len(reference_tokens), candidate.split())
+        for candidate in candidates
+    ]
+
+
+def _ngram_counts(tokens: List[str]) -> List[Counter]:
+    return [
+        Counter(zip(*(tokens[offset:] for offset in range(order))))
+        for order in range(1, _BLEU_MAX_ORDER + 1)
+    ]
+
+
+def _bleu(
+    reference_counts: List[Counter], reference_length: int, candidate_tokens: List[str]
+) -> float:
+    candidate_length = len(candidate_tokens)
+    if not candidate_length:
         return 0.0
 
-    smoothing = SmoothingFunction().method1
-    score = sentence_bleu([reference_tokens], candidate_tokens, smoothing_function=smoothing)
-    return float(score)
+    log_precision = 0.0
+    for order, (counts, ref_counts) in enumerate(
+        zip(_ngram_counts(candidate_tokens), reference_counts), start=1
+    ):
+        matches = sum(
+            min(count, ref_counts[ngram]) for ngram, count in counts.items() if ngram in ref_counts
+        )
+        if order == 1 and not matches:
+            # No unigram overlap at all scores 0 regardless of smoothing.
+            return 0.0
+        total = max(1, candidate_length - order + 1)
+        log_precision += math.log((matches or _BLEU_EPSILON) / total)
+
+    if candidate_length > reference_length:
+        brevity_penalty = 1.0
+    else:
+        brevity_penalty = math.exp(1 - reference_length / candidate_length)
+    return brevity_penalty * math.exp(log_precision / _BLEU_MAX_ORDER)
+
+
+class _CachedStemTokenizer(tokenizers.Tokenizer):
+    """rouge-score's default stemming tokenizer with memoized stems.
+
+    Porter stemming is pure Python and dominates ROUGE-L scoring, yet answers
+    reuse a small vocabulary, so each distinct word is stemmed once per
+    process. Tokens are identical to ``DefaultTokenizer(use_stemmer=True)``.
+    """
+
+    def __init__(self) -> None:
+        self._stem = lru_cache(maxsize=50_000)(porter.PorterStemmer().stem)
+
+    def tokenize(self, text: str) -> List[str]:
+        stem = self._stem
+        # Words of up to three characters are left unstemmed, as upstream.
+        return [
+            stem(token) if len(token) > 3 else token
+            for token in _NON_ALPHANUMERIC_RE.split(text.lower())
+            if token
+        ]
 
 
 @lru_cache(maxsize=1)
 def _get_rouge_scorer() -> rouge_scorer.RougeScorer:
-    return rouge_scorer.RougeScorer(["rougeL"], use_stemmer=True)
+    return rouge_scorer.RougeScorer(["rougeL"], tokenizer=_CachedStemTokenizer())
 
 
 def rouge_l(reference: str, candidate: str) -> float:
@@ -87,3 +176,18 @@ def summarize_metrics(baseline: str, rag: str) -> Dict[str, float]:
         "rouge": rouge_l(baseline, rag),
     }
 
+
+async def summarize_metrics_async(baseline: str, rag: str) -> Dict[str, float]:
+    """Async variant of :func:`summarize_metrics` for request handlers.
+
+    Each metric runs in its own worker thread. The embedding forward pass
+    behind cosine similarity releases the GIL, so it overlaps with the
+    pure-Python BLEU and ROUGE scoring instead of running after them.
+    """
+
+    cosine, bleu, rouge = await asyncio.gather(
+        run_in_threadpool(cosine_similarity, baseline, rag),
+        run_in_threadpool(bleu_score, baseline, rag),
+        run_in_threadpool(rouge_l, baseline, rag),
+    )
+    return {"cosine_similarity": cosine, "bleu": bleu, "rouge": rouge}
@@ -8,20 +8,24 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List
 
-import numpy as np
-
-from .embeddings import embed_query
+from .embeddings import embed_query_cached
 from .vector_store import get_vector_store
 
+# Line breaks and tabs inside a snippet would break the one-chunk-per-line
+# context layout; ``str.translate`` swaps them out in a single C pass.
+_WS_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
 
 def retrieve(query: str, top_k: int) -> List[Dict[str, object]]:
-    """Return the most similar chunks for a user query."""
+    """Return the most similar chunks for a user query.
+
+    Each hit is ``{"text": str, "score": float, "meta": dict}`` exactly as
+    produced by :meth:`VectorStore.search`; callers may rely on those types.
+    FAISS already returns hits in descending score order.
+    """
 
-    query_vector = embed_query(query)
-    store = get_vector_store()
-    hits = store.search(query_vector, top_k)
-    hits.sort(key=lambda item: float(item.get("score", 0.0)), reverse=True)
-    return hits
+    query_vector = embed_query_cached(query)
+    return get_vector_store().search(query_vector, top_k)
 
 
 def build_context(chunks: Iterable[Dict[str, object]]) -> str:
@@ -32,7 +36,7 @@ def build_context(chunks: Iterable[Dict[str, object]]) -> str:
         meta = chunk.get("meta", {})
         file_name = meta.get("file", "unknown")
         page = meta.get("page", "?")
-        snippet = chunk.get("text", "").replace("\n", " ").strip()
+        snippet = chunk.get("text", "").translate(_WS_TABLE).strip()
         lines.append(f"[{idx}] (file: {file_name}, page: {page}) {snippet}")
     return "\n".join(lines)
 
@@ -40,7 +44,8 @@ def build_context(chunks: Iterable[Dict[str, object]]) -> str:
 def average_similarity(chunks: Iterable[Dict[str, object]]) -> float:
     """Compute the arithmetic mean of cosine similarity scores."""
 
-    scores = [chunk.get("score", 0.0) for chunk in chunks]
+    # ``top_k`` is small, so plain ``sum`` beats building a NumPy array.
+    scores = [chunk["score"] for chunk in chunks]
     if not scores:
         return 0.0
-    return float(np.mean(scores))
+    return sum(scores) / len(scores)
@@ -7,7 +7,9 @@ sentence boundaries, which improves retrieval quality.
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from itertools import accumulate
 from typing import Dict, Iterable, List
 
 
@@ -39,36 +41,31 @@ def split_text(
     if chunk_overlap < 0 or chunk_overlap >= chunk_size:
         raise ValueError("chunk_overlap must be >=0 and < chunk_size")
 
-    chunks: List[Chunk] = []
-    start = 0
     text_length = len(text)
     step = chunk_size - chunk_overlap
-    chunk_index = 0
-
-    while start < text_length:
-        end = min(start + chunk_size, text_length)
-        chunk_text = text[start:end]
-        metadata = dict(base_metadata)
-        metadata.update({"chunk_id": chunk_index, "start": start, "end": end})
-        chunks.append(Chunk(text=chunk_text, metadata=metadata))
-        start += step
-        chunk_index += 1
+    # Window bounds come straight from ``range``; each chunk's metadata is
+    # built in one dict display instead of copy-then-update.
+    chunks = [
+        Chunk(
+            text=text[start : start + chunk_size],
+            metadata={
+                **base_metadata,
+                "chunk_id": chunk_index,
+                "start": start,
+                "end": min(start + chunk_size, text_length),
+            },
+        )
+        for chunk_index, start in enumerate(range(0, text_length, step))
+    ]
 
     # Attach page hints when available to aid the UI in surfacing context.
+    # Page ``n`` covers offsets below the n-th cumulative length, so each
+    # chunk's page is one binary search away.
     if page_texts:
+        page_ends = list(accumulate(len(page_text) for page_text in page_texts))
+        last_page = len(page_ends)
         for chunk in chunks:
-            chunk.metadata.setdefault("page", _infer_page(chunk, page_texts))
+            page = min(bisect_right(page_ends, chunk.metadata["start"]) + 1, last_page)
+            chunk.metadata.setdefault("page", page)
 
     return chunks
-
-
-def _infer_page(chunk: Chunk, page_texts: Iterable[str]) -> int:
-    """Best-effort heuristic: map chunk offsets to page numbers."""
-
-    pages = list(page_texts)
-    cumulative = 0
-    for idx, page_text in enumerate(pages):
-        cumulative += len(page_text)
-        if chunk.metadata.get("start", 0) < cumulative:
-            return idx + 1
-    return len(pages)
@@ -7,6 +7,9 @@ reusable helpers keeps business logic focused on the core problem.
 from __future__ import annotations
 
 import functools
+import os
+import re
+import stat
 import time
 import unicodedata
 import uuid
@@ -15,6 +18,15 @@ from typing import Any, Callable, Iterable
 
 from loguru import logger
 
+from settings import settings
+
+# Plain file names (no separators, no traversal) need no canonicalization.
+_SAFE_NAME_RE = re.compile(r"[A-Za-z0-9._-]{1,255}")
+# Runs of horizontal whitespace and ASCII control characters (common PDF
+# extraction debris such as NULs). Newlines are kept so page and paragraph
+# breaks survive normalization.
+_WHITESPACE_RE = re.compile(r"(?:[^\S\n]|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f])+")
+
 
 def generate_file_id(original_name: str) -> str:
     """Create a stable, unique file identifier for uploads.
@@ -28,31 +40,88 @@ def generate_file_id(original_name: str) -> str:
 
 
 def normalize_text(text: str) -> str:
-    """Normalize unicode text for consistent downstream processing."""
+    """Normalize unicode text for consistent downstream processing.
+
+    Besides NFKC folding, runs of spaces, tabs and control characters are
+    collapsed to a single space in one compiled-regex pass. NFKC leaves
+    pure-ASCII text unchanged, so that (common) case skips it.
+    """
 
-    return unicodedata.normalize("NFKC", text).strip()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+@functools.lru_cache(maxsize=8)
+def ensure_directory(directory: Path) -> Path:
+    """Create ``directory`` if needed and return it.
+
+    Memoized per path, so request handlers pay for the ``mkdir`` syscall once
+    per process rather than on every call.
+    """
+
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
 
 
 def safe_join(base: Path, *paths: Iterable[str | Path]) -> Path:
     """Safely join paths while preventing directory traversal attacks."""
 
-    resolved_base = base.resolve()
+    resolved_base = _resolve_base(base)
+    if len(paths) == 1:
+        name = paths[0]
+        if (
+            isinstance(name, str)
+            and name not in {".", ".."}
+            and _SAFE_NAME_RE.fullmatch(name)
+        ):
+            # A single plain name cannot escape ``base`` unless it is a
+            # symlink, so one ``lstat`` replaces the second ``resolve`` (one
+            # stat per path component). Symlinks take the full check below.
+            candidate = resolved_base / name
+            try:
+                is_link = stat.S_ISLNK(os.lstat(candidate).st_mode)
+            except FileNotFoundError:
+                is_link = False
+            if not is_link:
+                return candidate
     candidate = resolved_base.joinpath(*paths).resolve()
-    if not str(candidate).startswith(str(resolved_base)):
+    # Component-wise, unlike a string prefix test that lets ``/data/files2``
+    # pass for base ``/data/files``.
+    if not candidate.is_relative_to(resolved_base):
         raise ValueError("Attempted path traversal outside of base directory.")
     return candidate
 
 
-def log_time(action: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-    """Decorator that logs how long a function takes to execute."""
+@functools.lru_cache(maxsize=8)
+def _resolve_base(base: Path) -> Path:
+    # Base directories come from settings and do not move at runtime, so
+    # their canonical form is resolved once per process.
+    return base.resolve()
+
+
+def log_time(
+    action: str, enabled: bool | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator that logs how long a function takes to execute.
+
+    Timing is opt-in: unless ``enabled`` (default: ``settings.debug_timing``)
+    is true, the function is returned undecorated, with zero overhead.
+    """
+
+    if enabled is None:
+        enabled = settings.debug_timing
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if not enabled:
+            return func
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             start = time.perf_counter()
             result = func(*args, **kwargs)
             duration = time.perf_counter() - start
-            logger.info("%s completed in %.3f seconds", action, duration)
+            logger.info("{} completed in {:.3f} seconds", action, duration)
             return result
 
         return wrapper
@@ -7,142 +7,739 @@ rest of the pipeline.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import mmap
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Tuple
 
 import faiss
 import numpy as np
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from filelock import FileLock
 from loguru import logger
 
 from settings import settings
 
+# Scalar quantizers learn per-dimension value ranges; below this many
+# vectors the estimate is too noisy, so small stores stay float32.
+_MIN_QUANTIZER_TRAINING_VECTORS = 1024
+_QUANTIZED_INDEX_TYPES = (faiss.IndexScalarQuantizer, faiss.IndexHNSWSQ)
+# ``IO_FLAG_MMAP`` only maps IVF inverted lists; ``IO_FLAG_MMAP_IFC`` also maps
+# the vector storage of flat, int8 and HNSW indexes. FAISS builds without it
+# load a private copy instead.
+_IO_FLAG_MMAP_IFC = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+
+# A reload retries this many times when another worker rewrites the store
+# while it is being read.
+_LOAD_ATTEMPTS = 3
+
+
+class _Snapshot(NamedTuple):
+    """What searches read: an index and metadata no writer mutates any more."""
+
+    index: faiss.Index | None
+    texts: List[str]
+    metas: List[Dict[str, object]]
+    on_gpu: bool
+
 
 @dataclass
 class VectorStore:
-    """Lightweight wrapper over a FAISS index and parallel metadata."""
+    """Lightweight wrapper over a FAISS index and parallel metadata.
+
+    Row ``i`` of the index corresponds to ``texts[i]`` and ``metas[i]``. The
+    chunk text is kept apart from the rest of its metadata so search hits can
+    reference both without copying; on disk they are stored as one JSON line.
+
+    ``index``, ``texts`` and ``metas`` are the writer's working copy.
+    Searches never touch it: they read the last published :class:`_Snapshot`
+    without taking any lock, so retrieval does not wait behind a flush, a
+    purge, re-embedding or another worker's write. Writers copy a published
+    index before changing it and publish the result when done.
+
+    Several worker processes may share the files. Reads never write; every
+    write holds an inter-process lock file, brings the in-memory store up to
+    date with the disk first, and saves the index before the metadata.
+    """
 
     index_path: Path
     metadata_path: Path
     index: faiss.Index | None = None
-    metadata: List[Dict[str, object]] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    metas: List[Dict[str, object]] = field(default_factory=list)
+    # Whether ``index`` is read by a published snapshot or is a read-only
+    # memory map, i.e. must be copied before it is changed.
+    _shared: bool = field(default=False, init=False, repr=False)
+    _on_gpu: bool = field(default=False, init=False, repr=False)
+    _snapshot: _Snapshot = field(
+        default_factory=lambda: _Snapshot(None, [], [], False), init=False, repr=False
+    )
+    # Serializes writers (ingest, purges, flushes, reloads) within the process.
+    _write_lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False
+    )
+    # GPU indexes are not safe for concurrent searches; CPU ones are.
+    _gpu_search_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _loaded_version: Tuple[int, int, int] | None = field(default=None, init=False, repr=False)
+    # Batches added in memory but not yet written: (vectors, texts, metas).
+    _pending: List[Tuple[np.ndarray, List[str], List[Dict[str, object]]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    # Metadata records on disk past ``index.ntotal``, left by an interrupted write.
+    _unindexed_texts: List[str] = field(default_factory=list, init=False, repr=False)
+    _unindexed_metas: List[Dict[str, object]] = field(default_factory=list, init=False, repr=False)
+    # Whether the index and metadata files had matching row counts when read.
+    _disk_consistent: bool = field(default=True, init=False, repr=False)
+    _file_lock: FileLock = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.metadata_path.with_name(self.metadata_path.name + ".lock")
+        self._file_lock = FileLock(str(lock_path))
 
     def load(self) -> None:
-        """Load index and metadata from disk if present."""
+        """Load index and metadata from disk if present.
+
+        With ``faiss_mmap`` enabled the index's vector storage is
+        memory-mapped read-only, so several worker processes share the same
+        physical pages instead of each holding a private copy. The first
+        mutation works on a private copy.
+
+        Loading never embeds or writes. If the two files disagree (a write
+        was interrupted, or another worker is between its index and metadata
+        writes), only the first ``min(index.ntotal, len(metadata))`` rows are
+        served and the next write repairs the store. Adds of this process
+        that are not written yet are re-applied on top.
+
+        Writers replace whole files by rename, so each file is read as one
+        consistent version, but the pair may straddle another worker's
+        write. The metadata version is checked again after parsing and the
+        read is retried if it moved.
+        """
+
+        with self._write_lock:
+            self._load()
+
+    def _load(self) -> None:
+        for _ in range(_LOAD_ATTEMPTS):
+            version = self._disk_version()
+            self._read_from_disk()
+            if self._disk_version() == version:
+                break
+            logger.info("Vector store changed while loading, reading it again")
+        # Recording the version seen *before* reading means a write that
+        # landed mid-read is picked up by the next ``reload_if_changed``.
+        self._loaded_version = version
+
+        indexed = self.index.ntotal if self.index is not None else 0
+        self._disk_consistent = indexed == len(self.metas)
+        if not self._disk_consistent:
+            # Also seen briefly while another worker is between its two writes.
+            logger.info(
+                "FAISS index holds {} vectors for {} metadata records; serving the rows they share",
+                indexed,
+                len(self.metas),
+            )
+        self._unindexed_texts = self.texts[indexed:]
+        self._unindexed_metas = self.metas[indexed:]
+        del self.texts[indexed:]
+        del self.metas[indexed:]
+        for vectors, texts, metas in self._pending:
+            self._add_in_memory(vectors, texts, metas)
+        self._publish()
 
+    def _read_from_disk(self) -> None:
+        self.index = None
+        self.texts = []
+        self.metas = []
+        self._shared = False
+        self._on_gpu = False
         if self.index_path.exists():
-            self.index = faiss.read_index(str(self.index_path))
-            logger.info("Loaded FAISS index with %d vectors", self.index.ntotal)
+            if settings.faiss_mmap and _IO_FLAG_MMAP_IFC is not None:
+                self.index = faiss.read_index(
+                    str(self.index_path), _IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+                )
+                self._shared = True
+            else:
+                self.index = faiss.read_index(str(self.index_path))
+            logger.info("Loaded FAISS index with {} vectors", self.index.ntotal)
+            self._configure_search()
         if self.metadata_path.exists():
-            with self.metadata_path.open("r", encoding="utf-8") as fh:
-                self.metadata = [json.loads(line) for line in fh if line.strip()]
-            logger.info("Loaded %d metadata records", len(self.metadata))
+            self.metas = _read_jsonl(self.metadata_path)
+            # Freshly parsed records are owned here, so the text is popped in place.
+            self.texts = [record.pop("text", "") for record in self.metas]
+            logger.info("Loaded {} metadata records", len(self.metas))
+
+    def reload_if_changed(self) -> None:
+        """Reload when another worker process has rewritten the store on disk.
+
+        Never waits: while a write is in progress in this process, the
+        current snapshot keeps being served, and the writer publishes the
+        disk state it synced with when it finishes.
+        """
+
+        if self._disk_version() == self._loaded_version:
+            return
+        if not self._write_lock.acquire(blocking=False):
+            return
+        try:
+            if self._disk_version() != self._loaded_version:
+                logger.info("Vector store changed on disk, reloading")
+                self._load()
+        finally:
+            self._write_lock.release()
+
+    def _disk_version(self) -> Tuple[int, int, int] | None:
+        # Every write saves the metadata last, so a change here marks a
+        # completed write. Size and inode catch appends within one mtime tick
+        # and replacements by rename.
+        try:
+            stat = self.metadata_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _sync_with_disk(self) -> bool:
+        """Prepare for a write; call with ``_file_lock`` held.
+
+        Reloads if another worker wrote since this process last read the
+        store, then repairs what an interrupted write left behind: index rows
+        without metadata are dropped and metadata records without vectors are
+        embedded. Returns ``True`` when the files must be rewritten in full
+        rather than appended to.
+        """
+
+        if self._disk_version() != self._loaded_version:
+            self._load()
+        self._trim_index()
+        if self._unindexed_texts:
+            logger.warning(
+                "Re-embedding {} metadata records missing from the FAISS index",
+                len(self._unindexed_texts),
+            )
+            from services import embeddings
+
+            vectors = self._normalize(
+                embeddings.embed_texts(self._unindexed_texts), in_place=True
+            )
+            self._add_in_memory(vectors, self._unindexed_texts, self._unindexed_metas)
+            self._unindexed_texts = []
+            self._unindexed_metas = []
+        return not self._disk_consistent
+
+    def _trim_index(self) -> None:
+        """Drop index rows past the end of the metadata."""
+
+        if self.index is None or self.index.ntotal <= len(self.metas):
+            return
+        keep = len(self.metas)
+        logger.info("Dropping {} FAISS vectors without metadata", self.index.ntotal - keep)
+        self._replace_index(self._index_from_rows(list(range(keep))))
+
+    def _move_to_gpu(self) -> None:
+        """Move the index to the first GPU when ``faiss_gpu`` is enabled.
+
+        The exhaustive inner-product scan is the retrieval hot loop; on a GPU
+        it runs as one batched kernel. Index types without a GPU
+        implementation (e.g. flat scalar quantizers) stay on the CPU.
+        """
+
+        if not settings.faiss_gpu or self.index is None or self._on_gpu:
+            return
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("FAISS_GPU is set but no GPU-enabled FAISS build was found")
+            return
+        try:
+            self.index = faiss.index_cpu_to_gpu(_gpu_resources(), 0, self.index)
+        except RuntimeError as exc:
+            logger.warning("Keeping FAISS index on CPU: {}", exc)
+            return
+        self._on_gpu = True
+
+    def _publish(self) -> None:
+        """Make the working copy what searches read from now on."""
+
+        self._move_to_gpu()
+        # A single attribute store, so searches see the old snapshot or the
+        # new one, never a mix; no lock is needed around it.
+        self._snapshot = _Snapshot(self.index, self.texts, self.metas, self._on_gpu)
+        self._shared = self.index is not None
+
+    def _ensure_writable(self) -> None:
+        """Give the writer a private CPU copy of a published or mapped index."""
+
+        if not self._shared or self.index is None:
+            return
+        if self._on_gpu:
+            self.index = faiss.index_gpu_to_cpu(self.index)
+            self._on_gpu = False
+        else:
+            # Copied in memory rather than re-read from the path, which
+            # another worker may have replaced since this one loaded it.
+            # ``clone_index`` would keep viewing a memory map (and abort on
+            # the first ``add``); a serialize round trip owns its buffers.
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+        self._shared = False
+        self._configure_search()
+
+    def _configure_search(self) -> None:
+        # ``efSearch`` is a runtime knob and is not stored with the index.
+        hnsw = getattr(self.index, "hnsw", None)
+        if hnsw is not None:
+            hnsw.efSearch = settings.hnsw_ef_search
+
+    def _ensure_index(self, vectors: np.ndarray) -> faiss.Index:
+        """Return the index, creating it from the first batch if needed.
+
+        With ``embedding_precision="int8"`` vectors are stored as 8-bit
+        scalar-quantized codes (4x less memory traffic per scan than float32).
+        The quantizer learns per-dimension ranges from its training vectors;
+        queries stay float32 and are compared against the codes directly.
+        Until ``_MIN_QUANTIZER_TRAINING_VECTORS`` vectors exist the ranges
+        would be unreliable, so small corpora start on a float32 index and
+        are converted by :meth:`_quantize_if_ready`.
+
+        With ``index_type="hnsw"`` the vectors are linked into an HNSW graph,
+        so a query probes O(log N) neighbours instead of scanning every row.
+        Inner product on normalized vectors keeps scores equal to cosine.
+        """
 
-    def _ensure_index(self, dimension: int) -> faiss.Index:
         if self.index is None:
-            logger.info("Creating new FAISS index of dimension %d", dimension)
-            self.index = faiss.IndexFlatIP(dimension)
+            quantized = (
+                settings.embedding_precision == "int8"
+                and len(vectors) >= _MIN_QUANTIZER_TRAINING_VECTORS
+            )
+            self.index = self._new_index(vectors, quantized)
         return self.index
 
+    def _new_index(self, training_vectors: np.ndarray, quantized: bool) -> faiss.Index:
+        dimension = training_vectors.shape[1]
+        logger.info(
+            "Creating new {} {} index of dimension {}",
+            "int8" if quantized else "fp32",
+            settings.index_type,
+            dimension,
+        )
+        if settings.index_type == "hnsw":
+            if quantized:
+                index = faiss.IndexHNSWSQ(
+                    dimension,
+                    faiss.ScalarQuantizer.QT_8bit,
+                    settings.hnsw_m,
+                    faiss.METRIC_INNER_PRODUCT,
+                )
+            else:
+                index = faiss.IndexHNSWFlat(dimension, settings.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = settings.hnsw_ef_construction
+            index.hnsw.efSearch = settings.hnsw_ef_search
+        elif quantized:
+            index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexFlatIP(dimension)
+        if not index.is_trained:
+            index.train(training_vectors)
+        return index
+
+    def _quantize_if_ready(self) -> None:
+        """Convert a float32 index to int8 once it holds enough training vectors."""
+
+        if (
+            settings.embedding_precision != "int8"
+            or self.index is None
+            or self.index.ntotal < _MIN_QUANTIZER_TRAINING_VECTORS
+            or isinstance(self.index, _QUANTIZED_INDEX_TYPES)
+        ):
+            return
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        quantized = self._new_index(vectors, quantized=True)
+        quantized.add(vectors)
+        self._replace_index(quantized)
+
     def add(self, vectors: np.ndarray, metadatas: Iterable[Dict[str, object]]) -> None:
+        """Append ``vectors`` (normalized in place) with their metadata.
+
+        The batch is searchable in this process at once and is written every
+        ``faiss_flush_every`` adds and by :meth:`flush`: the index file is
+        rewritten in full, then only the new metadata lines are appended.
+        Batches not yet written are lost if the process dies first.
+        """
+
         if vectors.size == 0:
             return
-        vectors = self._normalize(vectors)
-        index = self._ensure_index(vectors.shape[1])
-        index.add(vectors)
-        for meta in metadatas:
-            self.metadata.append(meta)
-        self._persist()
+        texts: List[str] = []
+        metas: List[Dict[str, object]] = []
+        for record in metadatas:
+            texts.append(str(record.get("text", "")))
+            metas.append({key: value for key, value in record.items() if key != "text"})
+        vectors = self._normalize(vectors, in_place=True)
+        with self._write_lock:
+            self._add_in_memory(vectors, texts, metas)
+            self._pending.append((vectors, texts, metas))
+            if len(self._pending) >= settings.faiss_flush_every:
+                self._flush_pending()
+            self._publish()
+
+    def _add_in_memory(
+        self, vectors: np.ndarray, texts: List[str], metas: List[Dict[str, object]]
+    ) -> None:
+        self._trim_index()
+        self._ensure_writable()
+        self._ensure_index(vectors).add(vectors)
+        self._quantize_if_ready()
+        # New lists rather than ``extend``: the old ones may be published.
+        self.texts = self.texts + texts
+        self.metas = self.metas + metas
+
+    def flush(self) -> None:
+        """Write any adds that have not been saved yet."""
+
+        with self._write_lock:
+            if self._pending:
+                self._flush_pending()
+                self._publish()
+
+    def _flush_pending(self) -> None:
+        with self._file_lock:
+            if self._sync_with_disk():
+                self._persist()
+                return
+            self._write_index()
+            self._append_metadata(
+                [text for _, texts, _ in self._pending for text in texts],
+                [meta for _, _, metas in self._pending for meta in metas],
+            )
+            self._pending.clear()
 
     def remove_by_file(self, file_name: str) -> int:
         """Remove all vectors originating from a specific file."""
 
-        if not self.metadata:
+        return self.remove_by_files([file_name])
+
+    def remove_by_files(self, file_names: Iterable[str]) -> int:
+        """Remove all vectors originating from any of ``file_names`` in one pass.
+
+        Index types that support ``remove_ids`` drop the rows in place;
+        others (e.g. HNSW) are rebuilt once for the whole batch from the
+        stored vectors of the kept rows, without re-embedding any text.
+        Either way the files on disk are rewritten once per call.
+        """
+
+        targets = set(file_names)
+        with self._write_lock, self._file_lock:
+            try:
+                return self._remove_locked(targets)
+            finally:
+                self._publish()
+
+    def _remove_locked(self, targets: set[str]) -> int:
+        self._sync_with_disk()
+        if not self.metas or not targets:
             return 0
 
-        remaining: List[Dict[str, object]] = [
-            dict(record) for record in self.metadata if record.get("file") != file_name
-        ]
-        removed = len(self.metadata) - len(remaining)
-        if removed == 0:
+        keep: List[int] = []
+        drop: List[int] = []
+        for idx, meta in enumerate(self.metas):
+            (drop if meta.get("file") in targets else keep).append(idx)
+        if not drop:
             return 0
 
-        self._rebuild(remaining)
-        return removed
+        texts = [self.texts[idx] for idx in keep]
+        metas = [self.metas[idx] for idx in keep]
+        if not self._remove_ids(drop):
+            self._replace_index(self._index_from_rows(keep))
+        self.texts = texts
+        self.metas = metas
+        self._persist()
+        return len(drop)
+
+    def _remove_ids(self, ids: List[int]) -> bool:
+        if self.index is None or self.index.ntotal != len(self.metas):
+            return False
+        self._ensure_writable()
+        try:
+            # Flat indexes compact the remaining rows in order, so they stay
+            # aligned with the filtered metadata list.
+            self.index.remove_ids(np.asarray(ids, dtype="int64"))
+        except RuntimeError:
+            return False
+        return True
 
     def search(self, query_vector: np.ndarray, top_k: int) -> List[Dict[str, object]]:
-        if self.index is None or self.index.ntotal == 0:
-            return []
+        """Return up to ``top_k`` hits in descending score order.
+
+        Each hit's ``meta`` is the stored dict itself, not a copy, and must be
+        treated as read-only.
+        """
+
         query_vector = self._normalize(query_vector.reshape(1, -1))
-        scores, indices = self.index.search(query_vector, top_k)
-        hits: List[Dict[str, object]] = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx == -1 or idx >= len(self.metadata):
-                continue
-            record = dict(self.metadata[idx])
-            hits.append({"text": record.pop("text", ""), "score": float(score), "meta": record})
-        return hits
+        index, texts, metas, on_gpu = self._snapshot
+        if index is None or index.ntotal == 0:
+            return []
+        if on_gpu:
+            with self._gpu_search_lock:
+                scores, indices = index.search(query_vector, top_k)
+        else:
+            scores, indices = index.search(query_vector, top_k)
+        return [
+            {"text": texts[idx], "score": score, "meta": metas[idx]}
+            for score, idx in zip(scores[0].tolist(), indices[0].tolist())
+            if 0 <= idx < len(metas)
+        ]
 
     def _persist(self) -> None:
+        """Rewrite both the index and the full metadata file."""
+
         if self.index is None:
+            self._clear()
             return
-        self.index_path.parent.mkdir(parents=True, exist_ok=True)
-        self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
-        faiss.write_index(self.index, str(self.index_path))
-        with self.metadata_path.open("w", encoding="utf-8") as fh:
-            for record in self.metadata:
-                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._write_index()
+        # Replaced by rename, so a worker reloading concurrently parses either
+        # the old file or the new one, never a half-written mix.
+        with _replacing(self.metadata_path) as tmp_path, tmp_path.open("wb") as fh:
+            _write_records(fh, self.texts, self.metas)
+        self._loaded_version = self._disk_version()
+        self._disk_consistent = True
+        self._pending.clear()
 
-    def _rebuild(self, records: List[Dict[str, object]]) -> None:
-        """Recreate the FAISS index from the provided metadata records."""
+    def _append_metadata(self, texts: List[str], metas: List[Dict[str, object]]) -> None:
+        with self.metadata_path.open("ab") as fh:
+            _write_records(fh, texts, metas)
+        self._loaded_version = self._disk_version()
 
-        if not records:
-            self._clear()
+    def _write_index(self) -> None:
+        if self.index is None:
             return
+        cpu_index = faiss.index_gpu_to_cpu(self.index) if self._on_gpu else self.index
+        # Write then rename: truncating the file in place would pull pages out
+        # from under other workers' memory maps (SIGBUS) and show readers a
+        # partially written index.
+        with _replacing(self.index_path) as tmp_path:
+            faiss.write_index(cpu_index, str(tmp_path))
 
-        texts = [record.get("text", "") for record in records]
-        if not any(texts):
-            self._clear()
-            return
+    def _index_from_rows(self, rows: List[int]) -> faiss.Index | None:
+        """Build a fresh index of the current kind from the stored vectors at ``rows``.
 
-        from services import embeddings
+        Stored vectors are already normalized, so nothing is re-embedded; an
+        int8 index retrains its quantizer on the decoded vectors.
+        """
 
-        vectors = embeddings.embed_texts(texts)
-        if vectors.size == 0:
-            self._clear()
-            return
+        if self.index is None or not rows:
+            return None
+        vectors = self.index.reconstruct_batch(np.asarray(rows, dtype="int64"))
+        index = self._new_index(vectors, isinstance(self.index, _QUANTIZED_INDEX_TYPES))
+        index.add(vectors)
+        return index
 
-        self.index = None
-        self.metadata = []
-        index = self._ensure_index(vectors.shape[1])
-        index.add(self._normalize(vectors))
-        self.metadata.extend(records)
-        self._persist()
+    def _replace_index(self, index: faiss.Index | None) -> None:
+        self.index = index
+        self._shared = False
+        self._on_gpu = False
 
     def _clear(self) -> None:
         """Reset in-memory and on-disk state for the store."""
 
         self.index = None
-        self.metadata = []
-        if self.index_path.exists():
-            self.index_path.unlink()
-        if self.metadata_path.exists():
-            self.metadata_path.unlink()
+        self.texts = []
+        self.metas = []
+        self._shared = False
+        self._on_gpu = False
+        self._pending.clear()
+        self._unindexed_texts = []
+        self._unindexed_metas = []
+        # Metadata goes first, so readers never pair it with a missing index.
+        self.metadata_path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+        self._loaded_version = None
+        self._disk_consistent = True
 
     @staticmethod
-    def _normalize(vectors: np.ndarray) -> np.ndarray:
-        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
-        norms[norms == 0] = 1.0
-        return vectors / norms
+    def _normalize(vectors: np.ndarray, *, in_place: bool = False) -> np.ndarray:
+        """L2-normalize rows with FAISS's SIMD kernel so inner product equals cosine.
+
+        With ``in_place`` a contiguous float32 input is normalized without any
+        allocation (the caller's array is modified); otherwise a copy is made.
+        All-zero rows are left untouched.
+        """
+
+        if in_place:
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        else:
+            vectors = np.array(vectors, dtype=np.float32, order="C")
+        faiss.normalize_L2(vectors)
+        return vectors
+
+
+@contextmanager
+def _replacing(path: Path) -> Iterator[Path]:
+    """Yield a fresh temporary path that atomically replaces ``path`` on success.
+
+    The name is unique per call, so concurrent writers in different worker
+    processes never share (and truncate) each other's temporary file.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield Path(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, object]]:
+    """Parse a JSON-lines file with orjson straight from a memory map.
+
+    Every record ends with a newline, so a trailing line without one is an
+    append still in progress and is skipped.
+    """
+
+    with path.open("rb") as fh:
+        if fh.seek(0, 2) == 0:
+            # Zero-length files cannot be memory-mapped.
+            return []
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return [
+                orjson.loads(line)
+                for line in iter(mapped.readline, b"")
+                if line.endswith(b"\n") and not line.isspace()
+            ]
+
+
+def _write_records(fh: BinaryIO, texts: List[str], metas: List[Dict[str, object]]) -> None:
+    # Text goes first, matching the layout ingestion has always written.
+    for text, meta in zip(texts, metas):
+        fh.write(orjson.dumps({"text": text, **meta}, option=orjson.OPT_APPEND_NEWLINE))
+
+
+@lru_cache(maxsize=1)
+def _gpu_resources() -> "faiss.StandardGpuResources":
+    # One resource object per process; it owns the scratch memory for searches.
+    return faiss.StandardGpuResources()
+
+
+class DeletionQueue:
+    """Coalesces vector purges for deleted files into batched removals.
+
+    Deleting many files from the UI would otherwise mutate (and possibly
+    rebuild) the index once per file. A single worker task collects names
+    for up to ``flush_interval`` seconds or ``max_batch`` names, then calls
+    :meth:`VectorStore.remove_by_files` once, which also keeps index
+    mutations from different requests strictly sequential.
+    """
+
+    def __init__(self, max_batch: int = 32, flush_interval: float = 0.05) -> None:
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[str] | None = None
+        self._worker: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Spawn the worker task; call from the running event loop."""
+
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Flush pending purges and stop the worker."""
+
+        if self._worker is None or self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping deletion queue with {} purges pending", self._queue.qsize())
+        self._worker.cancel()
+        self._worker = None
+        self._queue = None
+
+    async def enqueue(self, file_name: str) -> None:
+        """Schedule the vectors of ``file_name`` for removal."""
+
+        if self._queue is None:
+            # Not started (e.g. no lifespan in a test client): purge inline.
+            await run_in_threadpool(_purge_files, [file_name])
+            return
+        await self._queue.put(file_name)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await run_in_threadpool(_purge_files, batch)
+            except Exception:
+                logger.exception("Failed to purge vectors for {}", batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+
+def _purge_files(file_names: List[str]) -> None:
+    # ``get_vector_store`` may reload from disk, so it is resolved here, in
+    # the worker thread, rather than on the event loop.
+    removed = get_vector_store().remove_by_files(file_names)
+    logger.info("Purged {} vectors for {} deleted files", removed, len(file_names))
+
+
+deletion_queue = DeletionQueue()
 
 
 _store: VectorStore | None = None
+_store_lock = threading.Lock()
 
 
 def get_vector_store() -> VectorStore:
+    """Return the per-process store, loading it on first use.
+
+    Loading is double-checked under a lock so concurrent first requests do
+    not each read a (possibly multi-GB) index from disk.
+    """
+
     global _store
     if _store is None:
-        _store = VectorStore(settings.faiss_index_path, settings.metadata_path)
-        _store.load()
+        with _store_lock:
+            if _store is None:
+                if settings.faiss_mmap and _IO_FLAG_MMAP_IFC is None:
+                    logger.warning("FAISS_MMAP is set but this FAISS build cannot map indexes")
+                store = VectorStore(settings.faiss_index_path, settings.metadata_path)
+                store.load()
+                atexit.register(store.flush)
+                # Publish only after loading, so readers never see a half-loaded store.
+                _store = store
+    else:
+        # Other uvicorn workers may have ingested or deleted files.
+        _store.reload_if_changed()
     return _store
+
+
+def flush_vector_store() -> None:
+    """Save pending index writes, if the store was ever loaded."""
+
+    if _store is not None:
+        _store.flush()
@@ -6,9 +6,10 @@ provide convenient defaults. By keeping configuration logic isolated, we
 make the rest of the codebase cleaner and easier to test.
 """
 
+import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseSettings, Field
 
@@ -36,6 +37,24 @@ class Settings(BaseSettings):
     chunk_size: int = Field(default=400, env="CHUNK_SIZE")
     chunk_overlap: int = Field(default=120, env="CHUNK_OVERLAP")
     default_top_k: int = Field(default=8, env="TOP_K")
+    files_listing_ttl: float = Field(default=5.0, env="FILES_LISTING_TTL")
+    faiss_mmap: bool = Field(default=False, env="FAISS_MMAP")
+    faiss_gpu: bool = Field(default=False, env="FAISS_GPU")
+    libreoffice_daemon: bool = Field(default=False, env="LIBREOFFICE_DAEMON")
+    libreoffice_port: int = Field(default=2003, env="LIBREOFFICE_PORT")
+    embedding_precision: Literal["fp32", "int8"] = Field(
+        default="fp32", env="EMBEDDING_PRECISION"
+    )
+    index_type: Literal["flat", "hnsw"] = Field(default="flat", env="FAISS_INDEX_TYPE")
+    hnsw_m: int = Field(default=32, env="HNSW_M")
+    hnsw_ef_construction: int = Field(default=200, env="HNSW_EF_CONSTRUCTION")
+    hnsw_ef_search: int = Field(default=64, env="HNSW_EF_SEARCH")
+    faiss_flush_every: int = Field(default=1, ge=1, env="FAISS_FLUSH_EVERY")
+    threadpool_size: int = Field(
+        default_factory=lambda: (os.cpu_count() or 1) * 2, env="BACKEND_THREADPOOL_SIZE"
+    )
+    llm_concurrency: int = Field(default=100, env="LLM_CONCURRENCY")
+    debug_timing: bool = Field(default=False, env="DEBUG_TIMING")
 
     class Config:
         env_file = ".env"
@@ -43,7 +62,7 @@ class Settings(BaseSettings):
 
 
 @lru_cache(maxsize=1)
-def get_settings() -> Settings:
+def load_settings() -> Settings:
     """Return a cached ``Settings`` instance.
 
     The ``lru_cache`` decorator ensures we only parse environment variables
@@ -54,5 +73,18 @@ def get_settings() -> Settings:
     return Settings()
 
 
-settings = get_settings()
+settings = load_settings()
 """Module-level accessor so other modules can simply ``from settings import settings``."""
+
+
+async def get_settings() -> Settings:
+    """FastAPI dependency that returns the process-wide settings singleton.
+
+    Declared ``async`` so FastAPI resolves it directly on the event loop;
+    synchronous dependencies are dispatched to the threadpool on every
+    request, which is wasted work for a cached lookup. Returning the module
+    attribute skips even the ``lru_cache`` call. Tests can still swap it via
+    ``app.dependency_overrides``.
+    """
+
+    return settings